@@ -1,8 +1,13 @@
-import json
+import multiprocessing
+import os
+import queue
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from pathlib import Path
 from datetime import datetime
-from typing import Tuple, Dict, List
+from typing import Any, Tuple, Dict, List
 import numpy as np
+import orjson
 from clearml import Dataset
 from loguru import logger
 from src.config.settings import EnvSettings
@@ -18,27 +23,35 @@ def process_file_pair(
         output_folder: Path,
         new_resolution: Tuple[int, int],
         category_id: int,
-        annot_id: int,
         annot_npy_dir: Path,
-        annot_bbox_dir: Path
+        annot_bbox_dir: Path,
+        annot_id_start: int = 0
 ):
     """
     Process a single image-annotation file pair.
 
+    Annotation IDs are numbered locally from `annot_id_start`; the caller is
+    responsible for renumbering them into a split-wide sequence.
+
     Returns:
-        image_json: Dict containing image metadata.
-        annot_id: Updated annotation ID after processing.
+        image_info: Dict containing image metadata.
+        annotations: List of annotation dictionaries for this image.
+        image_id: Identifier derived from the processed image filename.
+        original_vector_bbox: Dict with the structure's x/y min/max bounds.
+        write_items: List of (npy_path, array) pairs for the caller's
+            writer thread to persist.
     """
     # Process image and get scaling/padding factors
     new_img_path, scale_x, scale_y = process_image(
         str(raw_img_path), str(output_folder), new_resolution
     )
-    image_id = Path(new_img_path).stem  # Unique image ID based on filename without extension
+    new_img = Path(new_img_path)  # Parse once; .stem/.name below reuse it
+    image_id = new_img.stem  # Unique image ID based on filename without extension
     image_info = {
         "height": new_resolution[1],
         "width": new_resolution[0],
         "id": image_id,
-        "file_name": Path(new_img_path).name,
+        "file_name": new_img.name,
     }
 
     # Process annotation
@@ -59,16 +72,84 @@ def process_file_pair(
         logger=logger
     )
     coordinate_graph, code_graph = annotator.build_graphs()
-    annotations, annot_id = annotator.create_annotations(annot_id=annot_id)
-
-    npy_path = annot_npy_dir / f"{image_id}.npy"
-    np.save(str(npy_path), coordinate_graph)
+    annotations, _ = annotator.create_annotations(annot_id=annot_id_start)
 
     original_vector_bbox = annotator.create_structure_bbox()
-    npy_path = annot_bbox_dir / f"{image_id}.npy"
-    np.save(str(npy_path), original_vector_bbox)
 
-    return image_info, annotations, annot_id, image_id
+    # Defer the coordinate-graph write to the parent's writer thread so disk
+    # I/O overlaps with the next pair's compute. The bbox goes into the
+    # parent's memory-mapped store, so it is returned as-is.
+    write_items = [
+        (str(annot_npy_dir / f"{image_id}.npy"), coordinate_graph),
+    ]
+    return image_info, annotations, image_id, original_vector_bbox, write_items
+
+
+def _stream_json_array(out_f, ndjson_path: Path) -> None:
+    """
+    Stream the records of an .ndjson staging file into `out_f` as the
+    comma-separated body of a JSON array.
+    """
+    first = True
+    with open(str(ndjson_path), 'rb') as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            if not first:
+                out_f.write(b",")
+            out_f.write(line)
+            first = False
+
+
+def _npy_writer(write_queue: "queue.Queue", errors: List[BaseException]) -> None:
+    """
+    Consume (npy_path, array) items from the queue and save them to disk.
+    A `None` sentinel terminates the thread.
+
+    A failed write is recorded in `errors` and the thread keeps draining
+    the queue — dying here would leave the producer blocked on a full
+    queue — so the caller can re-raise after joining.
+    """
+    while True:
+        item = write_queue.get()
+        if item is None:
+            break
+        if errors:
+            continue  # A write already failed; just drain the queue
+        npy_path, array = item
+        # Write to a sidecar and atomically install, so readers never see a
+        # partially written file.
+        try:
+            tmp_path = npy_path + '.tmp'
+            with open(tmp_path, 'wb') as f:
+                np.save(f, array)
+            os.replace(tmp_path, npy_path)
+        except BaseException as exc:
+            errors.append(exc)
+
+
+def _process_file_pair_worker(task: Tuple) -> Tuple[Dict, List[Dict], str, Dict, List[Tuple[str, Any]]]:
+    """
+    Unpack a task tuple and run `process_file_pair` in a worker process.
+
+    The per-task seed reseeds np.random so each image gets an independent
+    semantic stream despite the workers sharing a forked RNG state. Each
+    worker numbers its annotations from 0; the parent renumbers them once
+    results are collected in order.
+    """
+    (raw_img_path, raw_annot_path, output_folder, new_resolution,
+     category_id, annot_npy_dir, annot_bbox_dir, seed) = task
+    np.random.seed(seed)
+    return process_file_pair(
+        raw_img_path,
+        raw_annot_path,
+        output_folder,
+        new_resolution,
+        category_id,
+        annot_npy_dir,
+        annot_bbox_dir
+    )
 
 
 def process_split_set(
@@ -89,42 +170,106 @@ def process_split_set(
     output_folder = Path(env.data_path) / split_set
     reset_directory(output_folder)
     output_json_file = annot_json_folder / f"instances_{split_set}.json"
+    # Staging files so image/annotation records stream to disk as they are
+    # produced instead of accumulating in RAM for the whole split.
+    images_ndjson_file = annot_json_folder / f"instances_{split_set}.images.ndjson"
+    annots_ndjson_file = annot_json_folder / f"instances_{split_set}.annotations.ndjson"
 
-    # Initialize output JSON structure
-    output_json: Dict = {
-        "categories": [
-            {
-                "supercategory": "Corner",
-                "id": category_id,
-                "name": "Corner"
-            }
-        ],
-        "images": [],
-        "annotations": []  # corrected key name
-    }
+    categories = [
+        {
+            "supercategory": "Corner",
+            "id": category_id,
+            "name": "Corner"
+        }
+    ]
     annot_id = 0
 
-    # Process each image-annotation pair
-    image_ids = []
-    for image_no, files in enumerate(zip(image_paths, annot_paths)):
-        raw_img_path, raw_annot_path = files
-        image_info, annotations, annot_id, image_id = process_file_pair(
-            raw_img_path,
-            raw_annot_path,
-            output_folder,
-            new_resolution,
-            category_id,
-            annot_id,
-            annot_npy_dir,
-            annot_bbox_dir
+    # Process image-annotation pairs in parallel; each pair is independent.
+    # Every task carries its own RNG seed: forked workers inherit the
+    # parent's np.random state, so without reseeding each worker would
+    # produce identical semantic draws.
+    task_seeds = np.random.randint(0, 2 ** 31 - 1, size=len(image_paths))
+    tasks = [
+        (raw_img_path, raw_annot_path, output_folder, new_resolution,
+         category_id, annot_npy_dir, annot_bbox_dir, int(seed))
+        for (raw_img_path, raw_annot_path), seed
+        in zip(zip(image_paths, annot_paths), task_seeds)
+    ]
+    # One raw memory-mapped (N, 4) store for all bboxes of the split; rows
+    # are [x_min, y_min, x_max, y_max]. The store is header-less — dtype and
+    # shape live in the index JSON, so loaders use np.memmap/np.fromfile.
+    bbox_bin_file = annot_bbox_dir / f"bboxes_{split_set}.bin"
+    if tasks:
+        bbox_store = np.memmap(
+            str(bbox_bin_file), mode='w+', dtype=np.int32, shape=(len(tasks), 4)
         )
-        output_json["images"].append(image_info)
-        output_json["annotations"].extend(annotations)
-        image_ids.append(image_id)
+    else:
+        # Splits can legitimately be empty (small or empty inputs); numpy
+        # cannot mmap a zero-length file, so just create the empty store.
+        with open(str(bbox_bin_file), 'wb'):
+            pass
+        bbox_store = None
+    bbox_index: Dict[str, int] = {}
+
+    image_ids = []
+    write_queue: "queue.Queue" = queue.Queue(maxsize=4)
+    writer_errors: List[BaseException] = []
+    writer = threading.Thread(target=_npy_writer, args=(write_queue, writer_errors))
+    # Fork workers where the platform allows it so they inherit the already
+    # imported clearml/cv2/pydantic stack instead of re-importing it under
+    # spawn, which costs seconds of startup per worker.
+    if 'fork' in multiprocessing.get_all_start_methods():
+        mp_context = multiprocessing.get_context('fork')
+    else:
+        mp_context = multiprocessing.get_context()
+    try:
+        with open(str(images_ndjson_file), 'wb') as images_f, \
+                open(str(annots_ndjson_file), 'wb') as annots_f, \
+                ProcessPoolExecutor(max_workers=os.cpu_count(),
+                                    mp_context=mp_context) as executor:
+            results = executor.map(_process_file_pair_worker, tasks, chunksize=8)
+            # map has submitted every task, so the workers have forked;
+            # only now start the writer thread — forking with another
+            # thread live risks inheriting a held lock.
+            writer.start()
+            for row, (image_info, annotations, image_id, bbox, write_items) in enumerate(results):
+                # Renumber worker-local annotation IDs into a split-wide sequence.
+                for annotation in annotations:
+                    annotation["id"] = annot_id
+                    annot_id += 1
+                    annots_f.write(orjson.dumps(annotation) + b"\n")
+                images_f.write(orjson.dumps(image_info) + b"\n")
+                image_ids.append(image_id)
+                bbox_store[row] = (bbox['x_min'], bbox['y_min'], bbox['x_max'], bbox['y_max'])
+                bbox_index[image_id] = row
+                for item in write_items:
+                    write_queue.put(item)
+    finally:
+        write_queue.put(None)
+        if writer.ident is not None:  # Only join once actually started
+            writer.join()
+    if writer_errors:
+        raise writer_errors[0]
+    if bbox_store is not None:
+        bbox_store.flush()
+    with open(str(annot_bbox_dir / f"bboxes_{split_set}_index.json"), 'wb') as f:
+        f.write(orjson.dumps({
+            "dtype": "int32",
+            "shape": [len(tasks), 4],
+            "columns": ["x_min", "y_min", "x_max", "y_max"],
+            "rows": bbox_index,
+        }))
 
-    # Save combined JSON file for this split set
-    with open(str(output_json_file), 'w') as f:
-        json.dump(output_json, f, indent=4)
+    # Assemble the combined JSON for this split by streaming the staged
+    # records; no split-wide list is ever held in memory.
+    with open(str(output_json_file), 'wb') as f:
+        f.write(b'{"categories":' + orjson.dumps(categories) + b',"images":[')
+        _stream_json_array(f, images_ndjson_file)
+        f.write(b'],"annotations":[')
+        _stream_json_array(f, annots_ndjson_file)
+        f.write(b']}')
+    os.remove(str(images_ndjson_file))
+    os.remove(str(annots_ndjson_file))
     logger.info(f"Saved JSON for split '{split_set}' to {output_json_file}")
     return image_ids
 
@@ -171,6 +316,12 @@ def main() -> None:
     image_json_file = Path(env.data_path) / f"image_numbers.json"
     image_numbers = {}
     image_no = 1
+    # Register each finished split with ClearML in the background so the
+    # add_files scan overlaps the next split's processing. A single worker
+    # serializes the add_files calls — the Dataset object is not documented
+    # as thread-safe.
+    upload_pool = ThreadPoolExecutor(max_workers=1)
+    pending_uploads = []
     for split_set, file_groups in matched_files.items():
         image_paths, annot_paths = file_groups  # assume first list are images, second are annotations
         image_ids = process_split_set(
@@ -184,17 +335,34 @@ def main() -> None:
             env.data_annot_npy,
             env.data_original_vector_boundary
         )
+        # dataset_path keeps files under their split folder, matching the
+        # layout the baseline got from one add_files(path=env.data_path).
+        pending_uploads.append(upload_pool.submit(
+            dataset.add_files, path=str(Path(env.data_path) / split_set),
+            dataset_path=split_set
+        ))
         for imgid in image_ids:
             image_numbers[imgid] = image_no
             image_no+=1
-    with open(str(image_json_file), 'w+') as f:
-        json.dump(image_numbers, f, indent=4)
+    with open(str(image_json_file), 'wb') as f:
+        f.write(orjson.dumps(image_numbers))
 
     with open(str(dataset_name_file), 'w+') as f:
         f.write(dataset_name)
     logger.info("Completed Processing Data. Uploading dataset to ClearML ....")
 
-    dataset.add_files(path=env.data_path)
+    # Wait for the background per-split add_files calls, then register the
+    # metadata produced after the splits finished.
+    for pending in pending_uploads:
+        pending.result()
+    upload_pool.shutdown()
+    for extra_path, extra_dataset_path in (
+            (env.data_annot_json, "annot_json"),
+            (env.data_annot_npy, "annot_npy"),
+            (env.data_original_vector_boundary, "original_vector_boundary")):
+        dataset.add_files(path=str(extra_path), dataset_path=extra_dataset_path)
+    for extra_file in (image_json_file, dataset_name_file):
+        dataset.add_files(path=str(extra_file))
     dataset.upload()
     logger.info(f"Dataset uploaded successfully! Dataset ID: {dataset.id}")
 
@@ -11,6 +11,7 @@ setup(
         "networkx==2.6.3",
         "numpy==1.21.6",
         "opencv-python==4.5.3.56",
+        "orjson==3.8.3",
         "pillow==8.3.2",
         "scikit-image==0.19.2",
         "scipy==1.7.3",
@@ -1,8 +1,10 @@
 import cv2
-import itertools
-from typing import List, Tuple, Set, Union, Optional
+import numpy as np
+import shapely
+from typing import Dict, List, Tuple, Set, Union, Optional
 from shapely.geometry import Point, LineString, Polygon, MultiLineString
 from shapely.ops import linemerge
+from shapely.strtree import STRtree
 
 
 class GeometryProcessor:
@@ -59,15 +61,19 @@ class GeometryProcessor:
         self.logger.debug(f"Reading coordinates from file: {file_path}")
         coordinates_list: List[List[Tuple[int, int]]] = []
         try:
-            with open(file_path, 'r') as file:
-                for line in file:
-                    parts = line.strip().split()
-                    if not parts or len(parts) < 4:
-                        continue  # Skip empty or incomplete lines
-                    # Remove the last two words
-                    parts = parts[:-2]
-                    coordinates = [(int(parts[i]), int(parts[i + 1])) for i in range(0, len(parts), 2)]
-                    coordinates_list.append(coordinates)
+            # Pull the whole file in one read instead of iterating the file
+            # object line by line.
+            with open(file_path, 'rb') as file:
+                buffer = file.read()
+            for line in buffer.decode().splitlines():
+                parts = line.split()
+                if not parts or len(parts) < 4:
+                    continue  # Skip empty or incomplete lines
+                # Remove the last two words and convert the remaining tokens
+                # in one C-level pass instead of per-token int() calls.
+                values = np.array(parts[:-2], dtype=np.int64)
+                coordinates = list(zip(values[0::2].tolist(), values[1::2].tolist()))
+                coordinates_list.append(coordinates)
             self.logger.debug(f"Read {len(coordinates_list)} coordinate sets.")
         except Exception as e:
             self.logger.error(f"Error reading file {file_path}: {e}")
@@ -82,7 +88,14 @@ class GeometryProcessor:
             List[Polygon]: List of Polygon objects.
         """
         self.logger.debug("Creating polygons from coordinate data.")
-        polygons = [Polygon(coords) for coords in self.coordinates if coords]
+        rings = [coords for coords in self.coordinates if coords]
+        if not rings:
+            return []
+        # Build all rings/polygons in one vectorized shapely 2.x call
+        # instead of one Python-level Polygon constructor per ring.
+        flat = np.array([pt for ring in rings for pt in ring], dtype=np.float64)
+        ring_ids = np.repeat(np.arange(len(rings)), [len(ring) for ring in rings])
+        polygons = shapely.polygons(shapely.linearrings(flat, indices=ring_ids)).tolist()
         self.logger.debug(f"Created {len(polygons)} polygons.")
         return polygons
 
@@ -94,7 +107,9 @@ class GeometryProcessor:
             List[LineString]: List of exterior edges as LineString objects.
         """
         self.logger.debug("Extracting exterior edges from polygons.")
-        edges = [LineString(p.exterior.coords) for p in self.polygons]
+        if not self.polygons:
+            return []
+        edges = shapely.get_exterior_ring(self.polygons).tolist()
         self.logger.debug(f"Extracted {len(edges)} edges.")
         return edges
 
@@ -120,14 +135,26 @@ class GeometryProcessor:
             Set[Tuple[float, float]]: Set of (x, y) intersection points.
         """
         self.logger.debug("Calculating intersections among edges.")
-        intersection_points: Set[Tuple[float, float]] = set()
-        for edge1, edge2 in itertools.combinations(self.edges, 2):
-            inter = edge1.intersection(edge2)
-            if isinstance(inter, Point):
-                intersection_points.add((inter.x, inter.y))
-            elif inter.geom_type == "MultiPoint":
-                for pt in inter.geoms:
-                    intersection_points.add((pt.x, pt.y))
+        # Deduplicate on a 1e-3-grid snapped key so float jitter between
+        # equivalent intersections cannot yield near-duplicate vertices;
+        # the first exact coordinates seen for a cell are kept.
+        snapped: Dict[Tuple[int, int], Tuple[float, float]] = {}
+        # Prune candidate pairs through an STR-tree bounding-box query
+        # instead of intersecting every pair of edges.
+        tree = STRtree(self.edges)
+        for i, edge1 in enumerate(self.edges):
+            for j in tree.query(edge1):
+                if j <= i:
+                    continue  # Each pair only once
+                inter = edge1.intersection(self.edges[j])
+                if isinstance(inter, Point):
+                    snapped.setdefault((round(inter.x * 1000), round(inter.y * 1000)),
+                                       (inter.x, inter.y))
+                elif inter.geom_type == "MultiPoint":
+                    for pt in inter.geoms:
+                        snapped.setdefault((round(pt.x * 1000), round(pt.y * 1000)),
+                                           (pt.x, pt.y))
+        intersection_points = set(snapped.values())
         self.logger.debug(f"Found {len(intersection_points)} intersection points.")
         return intersection_points
 
@@ -170,62 +197,97 @@ class GeometryProcessor:
     def split_line_by_candidate_points(
             end1: Tuple[int, int],
             end2: Tuple[int, int],
-            candidate_points: Set[Tuple[float, float]],
+            candidate_points: Union[np.ndarray, Set[Tuple[float, float]]],
             tolerance: float = 1e-6
     ) -> List[Point]:
         """
         Split a line (defined by two endpoints) by inserting candidate points that lie on the line.
 
+        Membership is decided with a vectorized cross/dot product test: a
+        candidate P lies on segment AB when |cross(AB, AP)| is within the
+        tolerance band and its projection falls inside [A, B].
+
         Args:
             end1 (Tuple[int, int]): The first endpoint.
             end2 (Tuple[int, int]): The second endpoint.
-            candidate_points (Set[Tuple[float, float]]): Candidate points to check.
+            candidate_points (np.ndarray or Set[Tuple[float, float]]):
+                Candidate points to check, as a (K, 2) array or a set of tuples.
             tolerance (float): Tolerance for considering a point to be on the line.
 
         Returns:
             List[Point]: Sorted list of Points along the line.
         """
-        pt1, pt2 = Point(end1), Point(end2)
-        line = LineString([pt1, pt2])
-        included = [pt1, pt2]
-        for cp in candidate_points:
-            cp_point = Point(cp)
-            if line.distance(cp_point) < tolerance or line.contains(cp_point):
-                included.append(cp_point)
+        a = np.asarray(end1, dtype=np.float64)
+        b = np.asarray(end2, dtype=np.float64)
+        if isinstance(candidate_points, np.ndarray):
+            cand = candidate_points.reshape(-1, 2).astype(np.float64, copy=False)
+        else:
+            cand = np.array(list(candidate_points), dtype=np.float64).reshape(-1, 2)
+
+        ab = b - a
+        ab2 = float(ab @ ab)
+        if len(cand) and ab2 > 0.0:
+            ap = cand - a
+            cross = ab[0] * ap[:, 1] - ab[1] * ap[:, 0]
+            dot = ap @ ab
+            band = tolerance * np.sqrt(ab2)
+            on_segment = (np.abs(cross) < band) & (dot >= -band) & (dot <= ab2 + band)
+            included = cand[on_segment]
+        else:
+            included = cand[:0]
+
+        all_points = np.vstack((a[np.newaxis], b[np.newaxis], included))
         # Sort points along the dominant axis
-        delta_x, delta_y = abs(pt2.x - pt1.x), abs(pt2.y - pt1.y)
-        sort_key = (lambda p: p.x) if delta_x > delta_y else (lambda p: p.y)
-        sorted_points = sorted(included, key=sort_key)
-        return sorted_points
+        axis = 0 if abs(ab[0]) > abs(ab[1]) else 1
+        order = np.argsort(all_points[:, axis], kind='stable')
+        return [Point(p) for p in all_points[order]]
 
-    def split_edges_into_segments(self) -> List[Tuple[Tuple[int, int], Tuple[int, int]]]:
+    def split_edges_into_segments(self) -> np.ndarray:
         """
         Split each edge into smaller segments using candidate intersection points.
 
         Returns:
-            List[Tuple[Tuple[int, int], Tuple[int, int]]]: Unique segments with integer coordinates.
+            np.ndarray: (M, 2, 2) int32 array of unique segments, where each
+                row holds the two endpoints of one segment.
         """
         self.logger.debug("Splitting edges into segments using intersection points.")
+        # Materialize the candidate set as one (K, 2) array up front instead
+        # of re-iterating the set of tuples for every edge.
+        candidates = np.fromiter(
+            (c for pt in self.intersection_points for c in pt),
+            dtype=np.float64, count=2 * len(self.intersection_points)
+        ).reshape(-1, 2)
         segments = []
         for pt1, pt2 in self.edges_list:
             pt1_int, pt2_int = tuple(map(int, pt1)), tuple(map(int, pt2))
-            seg_points = self.split_line_by_candidate_points(pt1_int, pt2_int, self.intersection_points)
+            seg_points = self.split_line_by_candidate_points(pt1_int, pt2_int, candidates)
             if len(seg_points) > 2:
                 segments.extend(self.create_segments(seg_points))
             else:
                 segments.append(seg_points)
-        unique_segments = set()
-        for seg in segments:
-            # Convert each segment to a tuple of integer coordinate pairs
-            p1 = (int(seg[0].x), int(seg[0].y))
-            p2 = (int(seg[1].x), int(seg[1].y))
-            unique_segments.add((p1, p2))
-        result = list(unique_segments)
+        if not segments:
+            return np.empty((0, 2, 2), dtype=np.int32)
+        # Deduplicate by packing each segment into one int64 key (endpoint
+        # order is already canonical from the dominant-axis sort above), so
+        # no nested tuples are hashed.
+        seg_arr = np.array(
+            [(int(s[0].x), int(s[0].y), int(s[1].x), int(s[1].y)) for s in segments],
+            dtype=np.int64
+        )
+        keys = ((seg_arr[:, 0] & 0xFFFF)
+                | ((seg_arr[:, 1] & 0xFFFF) << 16)
+                | ((seg_arr[:, 2] & 0xFFFF) << 32)
+                | ((seg_arr[:, 3] & 0xFFFF) << 48))
+        unique_rows = seg_arr[np.unique(keys, return_index=True)[1]]
+        # Keep the lexicographic ordering the tuple sort used to produce
+        order = np.lexsort((unique_rows[:, 3], unique_rows[:, 2],
+                            unique_rows[:, 1], unique_rows[:, 0]))
+        result = unique_rows[order].astype(np.int32).reshape(-1, 2, 2)
         self.logger.debug(f"Created {len(result)} unique segments.")
         return result
 
     def plot_segments(self,
-            segments: List[Tuple[Tuple[int, int], Tuple[int, int]]],
+            segments: np.ndarray,
             input_image: str = 'src/data_utils/plain_sheet.png',
             output_image: str = "polygons.png"
     ) -> None:
@@ -233,7 +295,7 @@ class GeometryProcessor:
         Draw segments and their endpoints on an image and save it.
 
         Args:
-            segments (List[Tuple[Tuple[int, int], Tuple[int, int]]]): List of segments to draw.
+            segments (np.ndarray): (M, 2, 2) array of segments to draw.
             input_image (str): Input image file path.
             output_image (str): Output image file path.
             logger: Optional logger to record the process.
@@ -246,39 +308,36 @@ class GeometryProcessor:
         if image is None:
             self.logger.error(f"Failed to read image: {input_image}")
             raise ValueError(f"Input image {input_image} not found.")
-        for pt1, pt2 in segments:
-            cv2.line(image, pt1, pt2, (0, 0, 0), 2)
-            cv2.circle(image, pt1, 10, (0, 0, 255), -1)
-            cv2.circle(image, pt2, 10, (0, 0, 255), -1)
+        pts = np.asarray(segments, dtype=np.int32).reshape(-1, 2, 2)
+        # One polylines call draws every segment; endpoints are deduplicated
+        # so each shared vertex circle is drawn once.
+        cv2.polylines(image, pts, isClosed=False, color=(0, 0, 0), thickness=2)
+        for pt in np.unique(pts.reshape(-1, 2), axis=0).tolist():
+            cv2.circle(image, tuple(pt), 10, (0, 0, 255), -1)
         cv2.imwrite(output_image, image)
         self.logger.info(f"Saved segments image to: {output_image}")
 
     @staticmethod
     def scale_segments(
-            segments: List[Tuple[Tuple[int, int], Tuple[int, int]]],
+            segments: np.ndarray,
             scale_x: float,
             scale_y: float,
-            # left_padding: int,
-            # top_padding: int
-    ) -> List[Tuple[Tuple[int, int], Tuple[int, int]]]:
+            left_padding: int = 0,
+            top_padding: int = 0
+    ) -> np.ndarray:
         """
-        Scale and translate segments by provided factors and paddings.
+        Scale and translate segments in one broadcasted operation.
 
         Args:
-            segments (List[Tuple[Tuple[int, int], Tuple[int, int]]]): List of segments.
+            segments (np.ndarray): (M, 2, 2) array of segment endpoints.
             scale_x (float): Scaling factor for x-coordinate.
             scale_y (float): Scaling factor for y-coordinate.
-            left_padding (int): Padding added to x-coordinate.
-            top_padding (int): Padding added to y-coordinate.
+            left_padding (int): Padding added to x-coordinate after scaling.
+            top_padding (int): Padding added to y-coordinate after scaling.
 
         Returns:
-            List[Tuple[Tuple[int, int], Tuple[int, int]]]: Scaled and translated segments.
+            np.ndarray: (M, 2, 2) int32 array of scaled and translated segments.
         """
-        scaled_segments = []
-        for (x1, y1), (x2, y2) in segments:
-            new_x1 = int(x1 * scale_x)
-            new_y1 = int(y1 * scale_y)
-            new_x2 = int(x2 * scale_x)
-            new_y2 = int(y2 * scale_y)
-            scaled_segments.append(((new_x1, new_y1), (new_x2, new_y2)))
-        return scaled_segments
+        scaled = (np.asarray(segments, dtype=np.float64) * np.array([scale_x, scale_y])
+                  + np.array([left_padding, top_padding]))
+        return scaled.astype(np.int32)
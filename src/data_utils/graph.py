@@ -1,8 +1,140 @@
 import numpy as np
-from collections import deque
-import random
 from typing import List, Tuple, Dict, Any, Union
 
+try:
+    from numba import njit
+except ImportError:  # numba is optional; fall back to the interpreted loop
+    njit = None
+
+
+def _bfs_levels(neighbors: np.ndarray, origin_id: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Breadth-first search over an (N, 4) neighbor-id array.
+
+    Uses a preallocated array as the FIFO queue; each node is enqueued at
+    most once, so N slots suffice.
+
+    Args:
+        neighbors (np.ndarray): (N, 4) int32 array of neighbor IDs, -1 for none.
+        origin_id (int): Node ID to start the traversal from.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]:
+            - levels: (N,) int32 BFS level per node, -1 if unreachable.
+            - order: visited node IDs in BFS order.
+    """
+    num_nodes = neighbors.shape[0]
+    levels = np.full(num_nodes, -1, dtype=np.int32)
+    queue = np.empty(num_nodes, dtype=np.int32)
+    head = 0
+    tail = 0
+    queue[tail] = origin_id
+    tail += 1
+    levels[origin_id] = 0
+    while head < tail:
+        node = queue[head]
+        head += 1
+        for direction in range(4):
+            neighbor = neighbors[node, direction]
+            if neighbor >= 0 and levels[neighbor] < 0:
+                levels[neighbor] = levels[node] + 1
+                queue[tail] = neighbor
+                tail += 1
+    return levels, queue[:tail]
+
+
+def _scatter_edges(edge_ids: np.ndarray, dx: np.ndarray, dy: np.ndarray,
+                   num_nodes: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Fill the flat neighbor/code arrays from interned segment endpoints in a
+    single loop, classifying both directions with the same sign/magnitude
+    rule as `GraphAnnotator.get_direction_index`.
+
+    Only used when numba compiles it; the interpreted equivalent would be
+    slower than the vectorized scatter in `build_graphs`.
+
+    Args:
+        edge_ids (np.ndarray): (E, 2) int32 node-id pairs per segment.
+        dx (np.ndarray): X deltas from each segment's first to second point.
+        dy (np.ndarray): Inverted Y deltas, matching image coordinates.
+        num_nodes (int): Number of interned nodes.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]:
+            - neighbors: (N, 4) int32 neighbor IDs, -1 for none.
+            - codes: (N,) uint8 connectivity bitmasks.
+    """
+    neighbors = np.full((num_nodes, 4), -1, dtype=np.int32)
+    codes = np.zeros(num_nodes, dtype=np.uint8)
+    for k in range(edge_ids.shape[0]):
+        node_a = edge_ids[k, 0]
+        node_b = edge_ids[k, 1]
+        adx = abs(dx[k])
+        ady = abs(dy[k])
+        if dx[k] >= 0 and adx >= ady:
+            dir_ab = 3
+        elif dx[k] < 0 and adx > ady:
+            dir_ab = 2
+        elif dy[k] >= 0:
+            dir_ab = 0
+        else:
+            dir_ab = 1
+        if -dx[k] >= 0 and adx >= ady:
+            dir_ba = 3
+        elif -dx[k] < 0 and adx > ady:
+            dir_ba = 2
+        elif -dy[k] >= 0:
+            dir_ba = 0
+        else:
+            dir_ba = 1
+        neighbors[node_a, dir_ab] = node_b
+        neighbors[node_b, dir_ba] = node_a
+        codes[node_a] |= np.uint8(1 << dir_ab)
+        codes[node_b] |= np.uint8(1 << dir_ba)
+    return neighbors, codes
+
+
+if njit is not None:
+    _bfs_levels = njit(cache=True)(_bfs_levels)
+    _scatter_edges = njit(cache=True)(_scatter_edges)
+else:
+    def _bfs_levels(neighbors: np.ndarray, origin_id: int) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Level-synchronous BFS: each iteration expands the whole frontier
+        with vectorized gathers instead of dequeuing one node at a time.
+
+        A frontier's children are deduplicated by first occurrence, which
+        reproduces the enqueue order of the sequential loop exactly.
+
+        Args:
+            neighbors (np.ndarray): (N, 4) int32 array of neighbor IDs, -1 for none.
+            origin_id (int): Node ID to start the traversal from.
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]:
+                - levels: (N,) int32 BFS level per node, -1 if unreachable.
+                - order: visited node IDs in BFS order.
+        """
+        num_nodes = neighbors.shape[0]
+        levels = np.full(num_nodes, -1, dtype=np.int32)
+        levels[origin_id] = 0
+        frontier = np.array([origin_id], dtype=np.int32)
+        order_parts = [frontier]
+        level = 0
+        while True:
+            candidates = neighbors[frontier].ravel()
+            candidates = candidates[candidates >= 0]
+            candidates = candidates[levels[candidates] < 0]
+            if candidates.size == 0:
+                break
+            # Stable first-occurrence dedup within the new frontier.
+            _, first_seen = np.unique(candidates, return_index=True)
+            frontier = candidates[np.sort(first_seen)]
+            level += 1
+            levels[frontier] = level
+            order_parts.append(frontier)
+        return levels, np.concatenate(order_parts)
+
 
 class GraphAnnotator:
     """
@@ -10,8 +142,8 @@ class GraphAnnotator:
 
     The graph is maintained in two representations:
       - coordinate_graph: Stores neighboring points as coordinates.
-      - code_graph: Stores neighbor connectivity as a 4-character binary string representing
-                    connections in the order [Up, Left, Down, Right].
+      - code_graph: Stores neighbor connectivity as a 4-bit integer mask where
+                    bit i is set when the node has a neighbor in direction i.
 
     The class also constructs a quatree (via BFS) based on the coordinate graph and generates
     annotation dictionaries for further processing.
@@ -24,7 +156,15 @@ class GraphAnnotator:
         '1110': 12, '1111': 13, '0101': 14, '1010': 15
     }
 
-    def __init__(self, segments: List[Tuple[Tuple[int, int], Tuple[int, int]]],
+    # Same mapping as a length-16 LUT indexed directly by the 4-bit
+    # connectivity mask (bit i = string position i), so the hot lookup is an
+    # array index instead of a string hash.
+    _edge_code_lut: np.ndarray = np.zeros(16, dtype=np.int8)
+    for _mask_str, _code in edges_rev.items():
+        _edge_code_lut[int(_mask_str[::-1], 2)] = _code
+    del _mask_str, _code
+
+    def __init__(self, segments: np.ndarray,
                  image_id: Union[int, str],
                  category_id: Union[int, str],
                  logger) -> None:
@@ -32,17 +172,17 @@ class GraphAnnotator:
         Initialize the GraphAnnotator.
 
         Args:
-            segments (List[Tuple[Tuple[int, int], Tuple[int, int]]]):
-                List of segments, each defined by two points (pt1, pt2).
+            segments (np.ndarray): (M, 2, 2) array of segments, each row
+                holding the two endpoints (pt1, pt2).
             image_id (int or str): Identifier for the image.
             category_id (int or str): Identifier for the category.
         """
         self.logger = logger
-        self.segments = segments
+        self.segments = np.asarray(segments, dtype=np.int32).reshape(-1, 2, 2)
         self.image_id = image_id
         self.category_id = category_id
         self.coordinate_graph: Dict[Any, Any] = {}  # Keys: points; Values: list of neighbor coordinates.
-        self.code_graph: Dict[Any, str] = {}  # Keys: points; Values: neighbor connectivity as a binary string.
+        self.code_graph: Dict[Any, int] = {}  # Keys: points; Values: neighbor connectivity as a 4-bit mask.
         self.annotations: List[Dict[str, Any]] = []  # List to store annotation dictionaries.
         self.logger.info(f"GraphAnnotator initialized with {len(segments)} segments.")
 
@@ -56,14 +196,14 @@ class GraphAnnotator:
         """
         return [(-1, -1)] * 4
 
-    def init_neighbors_as_code(self) -> str:
+    def init_neighbors_as_code(self) -> int:
         """
-        Initialize a neighbor connectivity code string.
+        Initialize a neighbor connectivity bitmask.
 
         Returns:
-            str: A 4-character binary string ("0000") representing no connections.
+            int: A 4-bit mask (0) representing no connections.
         """
-        return "0000"
+        return 0
 
     def get_direction_index(self, origin: Tuple[int, int], point: Tuple[int, int]) -> int:
         """
@@ -84,103 +224,146 @@ class GraphAnnotator:
         """
         dx = point[0] - origin[0]
         dy = origin[1] - point[1]  # Invert Y-axis for image coordinates
-        angle = np.degrees(np.arctan2(dy, dx))
-
-        if -45 <= angle <= 45:
-            return 3  # Right
-        elif 45 < angle <= 135:
-            return 0  # Up
-        elif angle > 135 or angle < -135:
+        # Pure sign/magnitude comparisons reproduce the arctan2 angle bins
+        # ([-45, 45] Right, (45, 135] Up, beyond 135 Left, [-135, -45) Down)
+        # without any trig, ties included.
+        adx, ady = abs(dx), abs(dy)
+        if dx >= 0:
+            if adx >= ady:
+                return 3  # Right
+        elif adx > ady:
             return 2  # Left
-        elif -135 <= angle < -45:
-            return 1  # Down
-        # Should not reach here; default to -1 if undefined
-        self.logger.warning(f"Undefined direction for origin {origin} and point {point}. Angle: {angle}")
-        breakpoint()
-        return -1
+        return 0 if dy >= 0 else 1  # Up / Down
 
-    def build_graphs(self) -> Tuple[Dict[Any, Any], Dict[Any, str]]:
+    @staticmethod
+    def _direction_indices(dx: np.ndarray, dy: np.ndarray) -> np.ndarray:
+        """
+        Vectorized equivalent of `get_direction_index` for arrays of deltas.
+
+        `dx`/`dy` follow the same convention as `get_direction_index` (dy is
+        already inverted for image coordinates). The sign/magnitude tests
+        reproduce the arctan2 angle bins exactly, including the ties at
+        +/-45 and 135 degrees.
+
+        Args:
+            dx (np.ndarray): X deltas from origin to target points.
+            dy (np.ndarray): Inverted Y deltas from origin to target points.
+
+        Returns:
+            np.ndarray: Direction indices (0: Up, 1: Down, 2: Left, 3: Right).
+        """
+        adx, ady = np.abs(dx), np.abs(dy)
+        return np.where(
+            (dx >= 0) & (adx >= ady), 3,
+            np.where((dx < 0) & (adx > ady), 2, np.where(dy >= 0, 0, 1))
+        )
+
+    def build_graphs(self, build_code: bool = True) -> Tuple[Dict[Any, Any], Dict[Any, int]]:
         """
         Build the coordinate and code graphs from the segments.
         Also constructs a quatree via BFS that is stored in the coordinate_graph under the 'quatree' key.
 
+        Args:
+            build_code (bool): When False, skip all code-graph work and
+                return an empty code_graph. Callers that only consume the
+                coordinate graph (and never call `create_annotations`) can
+                pass False to avoid the per-edge connectivity updates.
+
         Returns:
-            Tuple[Dict[Any, Any], Dict[Any, str]]:
+            Tuple[Dict[Any, Any], Dict[Any, int]]:
                 - coordinate_graph: Graph with neighbors as coordinates.
-                - code_graph: Graph with neighbor connectivity as binary strings.
+                - code_graph: Graph with neighbor connectivity as bitmasks.
         """
         self.logger.info("Building graphs from segments.")
-        # Build graphs based on segments
-        for pt1, pt2 in self.segments:
-            if pt1 not in self.coordinate_graph:
-                self.coordinate_graph[pt1] = self.init_neighbors_as_coordinates()
-            if pt2 not in self.coordinate_graph:
-                self.coordinate_graph[pt2] = self.init_neighbors_as_coordinates()
-
-            if pt1 not in self.code_graph:
-                self.code_graph[pt1] = self.init_neighbors_as_code()
-            if pt2 not in self.code_graph:
-                self.code_graph[pt2] = self.init_neighbors_as_code()
-
-            # Determine direction indexes for each connection
-            dir_idx_pt1_to_pt2 = self.get_direction_index(pt1, pt2)
-            dir_idx_pt2_to_pt1 = self.get_direction_index(pt2, pt1)
-
-            # Update coordinate graph with neighbor points
-            self.coordinate_graph[pt1][dir_idx_pt1_to_pt2] = pt2
-            self.coordinate_graph[pt2][dir_idx_pt2_to_pt1] = pt1
-
-            # Update code graph by setting the corresponding digit to "1"
-            code_list_pt1 = list(self.code_graph[pt1])
-            code_list_pt1[dir_idx_pt1_to_pt2] = "1"
-            self.code_graph[pt1] = ''.join(code_list_pt1)
-
-            code_list_pt2 = list(self.code_graph[pt2])
-            code_list_pt2[dir_idx_pt2_to_pt1] = "1"
-            self.code_graph[pt2] = ''.join(code_list_pt2)
-
-            self.logger.debug(f"Connected {pt1} to {pt2}; updated indices {dir_idx_pt1_to_pt2} and {dir_idx_pt2_to_pt1}.")
-
-        # Find the starting point closest to (0, 0) (ignore any special keys like 'quatree')
-        valid_points = [pt for pt in self.coordinate_graph.keys() if pt != 'quatree']
-        origin = min(valid_points, key=lambda p: np.hypot(p[0], p[1]))
-        self.logger.info(f"Origin for quatree determined as {origin}.")
-
-        # BFS to construct quatree levels
-        visited = set()
-        queue = deque([(origin, 0)])  # Each entry is a tuple: (point, level)
-        quatree: Dict[int, List[Any]] = {}
-
-        while queue:
-            point, level = queue.popleft()
-            if point in visited:
-                continue
-            visited.add(point)
-            quatree.setdefault(level, []).append(point)
-            for neighbor in self.coordinate_graph[point]:
-                if neighbor != (-1, -1) and neighbor not in visited:
-                    queue.append((neighbor, level + 1))
-            self.logger.debug(f"Point {point} added at level {level} in quatree.")
+        # Per-segment deltas for both direction classifications; dy is
+        # inverted for image coordinates.
+        seg_arr = self.segments.astype(np.int64)
+        dx = seg_arr[:, 1, 0] - seg_arr[:, 0, 0]
+        dy = seg_arr[:, 0, 1] - seg_arr[:, 1, 1]
+
+        # Intern points to integer node IDs with a single np.unique pass so
+        # the graph can live in flat arrays instead of tuple-keyed dicts.
+        unique_pts, inverse = np.unique(self.segments.reshape(-1, 2), axis=0,
+                                        return_inverse=True)
+        edge_ids = inverse.reshape(-1, 2).astype(np.int32)
+        points: List[Tuple[int, int]] = [tuple(p) for p in unique_pts.tolist()]
+
+        num_nodes = len(points)
+        self._coords = unique_pts.astype(np.int32).reshape(num_nodes, 2)
+
+        if njit is not None:
+            # One fused C-speed loop classifies both directions and writes
+            # the neighbor/code arrays per segment.
+            self._neighbors, self._codes = _scatter_edges(edge_ids, dx, dy, num_nodes)
+        else:
+            idx_pt1_to_pt2 = self._direction_indices(dx, dy)
+            idx_pt2_to_pt1 = self._direction_indices(-dx, -dy)
+            self._neighbors = np.full((num_nodes, 4), -1, dtype=np.int32)
+            self._codes = np.zeros(num_nodes, dtype=np.uint8)
+
+            # Fill the SoA neighbor/code arrays with vectorized scatter updates.
+            # Both directions are interleaved per segment so that when two
+            # segments claim the same (node, direction) slot the later segment
+            # wins, exactly as the sequential edge loop resolved it.
+            num_edges = edge_ids.shape[0]
+            scatter_src = np.empty(2 * num_edges, dtype=np.int32)
+            scatter_dst = np.empty(2 * num_edges, dtype=np.int32)
+            scatter_dir = np.empty(2 * num_edges, dtype=np.int64)
+            scatter_src[0::2] = edge_ids[:, 0]
+            scatter_src[1::2] = edge_ids[:, 1]
+            scatter_dst[0::2] = edge_ids[:, 1]
+            scatter_dst[1::2] = edge_ids[:, 0]
+            scatter_dir[0::2] = idx_pt1_to_pt2
+            scatter_dir[1::2] = idx_pt2_to_pt1
+            self._neighbors[scatter_src, scatter_dir] = scatter_dst
+            if build_code:
+                np.bitwise_or.at(self._codes, scatter_src,
+                                 np.left_shift(1, scatter_dir).astype(np.uint8))
+
+        # Find the starting point closest to (0, 0); squared distance
+        # suffices for the argmin, so no hypot/sqrt is needed.
+        coords64 = self._coords.astype(np.int64)
+        origin_id = int(np.argmin(coords64[:, 0] ** 2 + coords64[:, 1] ** 2))
+        self.logger.info(f"Origin for quatree determined as {points[origin_id]}.")
+
+        # BFS over the int-indexed neighbor array to construct quatree levels.
+        # The FIFO order is already sorted by level, so one bincount/split
+        # groups nodes per level without a dict lookup per node.
+        levels, order = _bfs_levels(self._neighbors, origin_id)
+        level_counts = np.bincount(levels[order])
+        level_groups = np.split(order, np.cumsum(level_counts)[:-1])
+        quatree: Dict[int, List[Any]] = {
+            level: [points[i] for i in group.tolist()]
+            for level, group in enumerate(level_groups)
+        }
+
+        # Re-materialize the dict views consumed by annotation creation and
+        # the training dataset loader.
+        for i, pt in enumerate(points):
+            self.coordinate_graph[pt] = [
+                points[j] if j >= 0 else (-1, -1) for j in self._neighbors[i].tolist()
+            ]
+            if build_code:
+                self.code_graph[pt] = int(self._codes[i])
 
         self.coordinate_graph['quatree'] = [quatree]
         self.logger.info(f"quatree construction complete with levels: {list(quatree.keys())}")
         return self.coordinate_graph, self.code_graph
 
-    def get_edge_code(self, edges_class: str) -> int:
+    def get_edge_code(self, edges_class: int) -> int:
         """
-        Convert a 4-character binary string representing neighbor connectivity into an edge code.
+        Convert a 4-bit neighbor connectivity mask into an edge code.
 
         Args:
-            edges_class (str): 4-character binary string representing neighbor connections.
+            edges_class (int): 4-bit mask where bit i marks a neighbor in direction i.
 
         Returns:
             int: The corresponding edge code from the mapping.
         """
-        code = self.edges_rev.get(edges_class)
-        if code is None:
-            self.logger.error(f"Edge code not found for binary string: {edges_class}")
+        if not 0 <= edges_class < 16:
+            self.logger.error(f"Edge code not found for connectivity mask: {edges_class}")
             raise ValueError(f"Invalid edges_class: {edges_class}")
-        return code
+        return int(self._edge_code_lut[edges_class])
 
     def create_annotations(self, annot_id):
         """
@@ -197,21 +380,28 @@ class GraphAnnotator:
             List[Dict[str, Any]]: A list of annotation dictionaries.
         """
         self.logger.info("Creating annotations based on code graph.")
-        for key, value in self.code_graph.items():
-            # Skip special keys (e.g., the 'quatree' entry)
-            if key == 'quatree':
-                continue
-            semantics = random.choices(
-                ['living_room', 'kitchen', 'bedroom', 'bathroom', 'restroom', 'balcony', 'closet', 'corridor', 'washing_room', 'PS', 'outside', 'wall', 'no_type'],
-                k=4
-            )
+        # Draw every semantic tag up front in one RNG call instead of one
+        # random.choices invocation per node.
+        semantic_pool = np.array(
+            ['living_room', 'kitchen', 'bedroom', 'bathroom', 'restroom', 'balcony', 'closet', 'corridor', 'washing_room', 'PS', 'outside', 'wall', 'no_type']
+        )
+        choice_idx = np.random.randint(0, len(semantic_pool), size=(len(self.code_graph), 4))
+        all_semantics = semantic_pool[choice_idx].tolist()
+        # Resolve every connectivity mask through the LUT in one indexing
+        # operation; the masks come from build_graphs and are always < 16.
+        masks = np.fromiter(self.code_graph.values(), dtype=np.uint8,
+                            count=len(self.code_graph))
+        all_codes = self._edge_code_lut[masks].tolist()
+        # Only coordinate_graph ever receives the 'quatree' key, so every
+        # code_graph entry is a plain point node.
+        for index, key in enumerate(self.code_graph):
             annotation = {
                 "image_id": self.image_id,
                 "category_id": self.category_id,
                 "id": annot_id,
                 "point": list(key) if isinstance(key, tuple) else key,
-                "edge_code": self.get_edge_code(value),
-                "semantic": semantics
+                "edge_code": all_codes[index],
+                "semantic": all_semantics[index]
             }
             self.annotations.append(annotation)
             self.logger.debug(f"Annotation created: {annotation}")
@@ -221,12 +411,18 @@ class GraphAnnotator:
 
 
     def create_structure_bbox(self):
-        # Extract x and y values
-        x_values = [p[0] for p in self.code_graph.keys()]
-        y_values = [p[1] for p in self.code_graph.keys()]
-
-        # Compute bounding box
-        x_min, x_max = min(x_values), max(x_values)
-        y_min, y_max = min(y_values), max(y_values)
-
-        return {'x_min': x_min, 'y_min': y_min, 'x_max': x_max, 'y_max': y_max}
\ No newline at end of file
+        # Reuse the interned coordinate array from build_graphs when present;
+        # otherwise stack the code_graph keys once.
+        coords = getattr(self, '_coords', None)
+        if coords is None:
+            coords = np.fromiter(
+                (c for pt in self.code_graph for c in pt),
+                dtype=np.int32, count=2 * len(self.code_graph)
+            ).reshape(-1, 2)
+
+        # Compute bounding box with two vectorized reductions
+        mins = coords.min(axis=0)
+        maxs = coords.max(axis=0)
+
+        return {'x_min': int(mins[0]), 'y_min': int(mins[1]),
+                'x_max': int(maxs[0]), 'y_max': int(maxs[1])}
\ No newline at end of file
@@ -1,50 +1,112 @@
 import os
-from PIL import Image
-from typing import Tuple
+import threading
+from typing import Optional, Tuple
+
+import cv2
+import numpy as np
+
+try:
+    from turbojpeg import TurboJPEG
+except ImportError:  # PyTurboJPEG is optional; cv2 then decodes everything
+    TurboJPEG = None
+
+# Per-thread resize destination buffers and JPEG decoder state so repeated
+# calls reuse one allocation instead of malloc/free per image.
+_buffers = threading.local()
+
+
+def _get_jpeg_decoder():
+    """
+    Return this thread's cached TurboJPEG decoder, or None when PyTurboJPEG
+    is not installed.
+    """
+    if TurboJPEG is None:
+        return None
+    decoder = getattr(_buffers, 'jpeg', None)
+    if decoder is None:
+        decoder = TurboJPEG()
+        _buffers.jpeg = decoder
+    return decoder
+
+
+def _get_resize_buffer(shape: Tuple[int, int, int]) -> np.ndarray:
+    """
+    Return this thread's cached destination buffer, reallocating only when
+    the requested shape changes.
+
+    Args:
+        shape (Tuple[int, int, int]): Required (height, width, channels) shape.
+
+    Returns:
+        np.ndarray: A uint8 buffer of the requested shape.
+    """
+    buffer = getattr(_buffers, 'dst', None)
+    if buffer is None or buffer.shape != shape:
+        buffer = np.empty(shape, dtype=np.uint8)
+        _buffers.dst = buffer
+    return buffer
 
 
 def process_image(raw_img_path: str,
                   output_folder: str,
-                  new_resolution: Tuple[int, int]):
+                  new_resolution: Tuple[int, int],
+                  out: Optional[np.ndarray] = None):
     """
-    Processes an image by resizing it, centering it on a canvas of target resolution,
-    and saving the processed image.
+    Processes an image by resizing it to the target resolution and saving
+    the processed image.
 
     Args:
         raw_img_path (str): Path to the raw input image.
         output_folder (str): Folder where the processed image will be saved.
         new_resolution (Tuple[int, int]): Target (width, height) for the processed image.
+        out (np.ndarray, optional): Preallocated (height, width, 3) uint8
+            destination buffer for the resize; a thread-local buffer is used
+            when omitted.
 
     Returns:
-        Tuple[str, float, float, int, int]:
+        Tuple[str, float, float]:
             - new_img_path (str): Path to the saved image.
             - scale_x (float): Scaling factor in the x-direction.
             - scale_y (float): Scaling factor in the y-direction.
-            - left_padding (int): Horizontal padding applied.
-            - top_padding (int): Vertical padding applied.
     """
     new_width, new_height = new_resolution
     new_img_path = os.path.join(output_folder, os.path.basename(raw_img_path))
 
-    with Image.open(raw_img_path) as img:
-        original_width, original_height = img.size
-        scale_x = new_width / float(original_width)
-        scale_y = new_height / float(original_height)
-        # scale_x = new_width / original_width
-        # scale_y = new_height / original_height
-        #
-        # # Resize image while maintaining aspect ratio
-        # img.thumbnail(new_resolution)
-        #
-        # # Create a blank white canvas and calculate padding to center the image
-        # canvas = Image.new("RGB", new_resolution, (255, 255, 255))
-        # left_padding = (new_width - img.width) // 2
-        # top_padding = (new_height - img.height) // 2
-        # canvas.paste(img, (left_padding, top_padding))
-        #
-        # # Save the processed image
-        # canvas.save(new_img_path)
-        img_resized = img.resize((new_width, new_height), Image.LANCZOS)
-        img_resized.save(new_img_path)
+    # Decode .jpg through libjpeg-turbo when available; fall back to cv2.
+    img = None
+    if os.path.splitext(raw_img_path)[1].lower() in ('.jpg', '.jpeg'):
+        decoder = _get_jpeg_decoder()
+        if decoder is not None:
+            with open(raw_img_path, 'rb') as f:
+                img = decoder.decode(f.read())
+    if img is None:
+        img = cv2.imread(raw_img_path, cv2.IMREAD_COLOR)
+    if img is None:
+        raise ValueError(f"Failed to read image: {raw_img_path}")
+    original_height, original_width = img.shape[:2]
+    scale_x = new_width / float(original_width)
+    scale_y = new_height / float(original_height)
+
+    if (original_width, original_height) == (new_width, new_height):
+        # Already at the target resolution; skip the resize entirely.
+        out = img
+    else:
+        if out is None:
+            out = _get_resize_buffer((new_height, new_width, 3))
+        # INTER_AREA averages source pixels and is both faster and cleaner
+        # when shrinking; Lanczos only pays off when enlarging.
+        if new_width < original_width or new_height < original_height:
+            interpolation = cv2.INTER_AREA
+        else:
+            interpolation = cv2.INTER_LANCZOS4
+        cv2.resize(img, (new_width, new_height), dst=out, interpolation=interpolation)
+    # Encode in memory and atomically install via os.replace so concurrent
+    # readers never observe a partially written image.
+    ok, encoded = cv2.imencode(os.path.splitext(new_img_path)[1], out)
+    if not ok:
+        raise ValueError(f"Failed to encode image: {new_img_path}")
+    tmp_path = new_img_path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(encoded.tobytes())
+    os.replace(tmp_path, new_img_path)
     return new_img_path, scale_x, scale_y
-    # return new_img_path, scale_x, scale_y, left_padding, top_padding
\ No newline at end of file
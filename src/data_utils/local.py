@@ -36,19 +36,20 @@ def list_matched_files(folder_path: Path, image_extensions: List[str], annot_ext
     image_files_dict = {}
     annot_files_dict = {}
 
-    for file in os.listdir(folder_path):
-        file_path = os.path.join(folder_path, file)
-        if os.path.isfile(file_path):
-            for img_ext in image_extensions:
-                if file.lower().endswith(img_ext.lower()):
-                    base_name = file[:-len(img_ext)]
-                    image_files_dict[base_name] = file_path
-                    break
-            for txt_ext in annot_extensions:
-                if file.lower().endswith(txt_ext.lower()):
-                    base_name = file[:-len(txt_ext)]
-                    annot_files_dict[base_name] = file_path
-                    break
+    # Lowercase the extension lists once and match via set lookup; scandir
+    # entries carry cached stat info, avoiding a stat syscall per file.
+    img_exts = {ext.lower() for ext in image_extensions}
+    annot_exts = {ext.lower() for ext in annot_extensions}
+    with os.scandir(folder_path) as entries:
+        for entry in entries:
+            if not entry.is_file():
+                continue
+            base_name, ext = os.path.splitext(entry.name)
+            ext = ext.lower()
+            if ext in img_exts:
+                image_files_dict[base_name] = entry.path
+            elif ext in annot_exts:
+                annot_files_dict[base_name] = entry.path
 
     # Find common base names that exist for both image and annot files
     common_base_names = list(set(image_files_dict.keys()).intersection(annot_files_dict.keys()))
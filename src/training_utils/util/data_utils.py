@@ -7,7 +7,7 @@ import torch
 import numpy as np
 from PIL import Image
 
-from src.training_utils.util.edges_utils import get_edges_alldirections, get_edges_alldirections_rev
+from src.training_utils.util.edges_utils import get_edges_alldirections, get_edge_class_by_mask
 from src.training_utils.util.math_utils import clip
 from src.training_utils.util.mean_std import mean, std
 
@@ -185,39 +185,33 @@ def get_random_region_targets(given_layers, graphs, targets):
             #     semantic_right_down.append(targets_i['semantic_right_down'][ind].item())
             #     semantic_left_down.append(targets_i['semantic_left_down'][ind].item())
 
+            # Encode neighbor presence directly as 4-bit masks (bit i =
+            # direction i) and map through the mask-indexed table instead of
+            # concatenating '0'/'1' strings and hashing them.
             edges = []
             for unnormalized_point in unnormalized_points:
-                edge = ''
+                edge = 0
                 adjs = graphs_i[unnormalized_point]
-                for adj in adjs:
+                for bit, adj in enumerate(adjs):
                     if adj != (-1, -1):
-                        edge += '1'
-                    else:
-                        edge += '0'
-                edge = get_edges_alldirections_rev(edge)
-                edges.append(edge)
+                        edge |= 1 << bit
+                edges.append(get_edge_class_by_mask(edge))
             last_edges = []
             for unnormalized_point in unnormalized_points:
-                last_edge = ''
+                last_edge = 0
                 adjs = graphs_i[unnormalized_point]
-                for adj in adjs:
+                for bit, adj in enumerate(adjs):
                     if adj in sampled_points_i_given:
-                        last_edge += '1'
-                    else:
-                        last_edge += '0'
-                last_edge = get_edges_alldirections_rev(last_edge)
-                last_edges.append(last_edge)
+                        last_edge |= 1 << bit
+                last_edges.append(get_edge_class_by_mask(last_edge))
             this_edges = []
             for unnormalized_point in unnormalized_points:
-                this_edge = ''
+                this_edge = 0
                 adjs = graphs_i[unnormalized_point]
-                for adj in adjs:
+                for bit, adj in enumerate(adjs):
                     if adj in unnormalized_points:
-                        this_edge += '1'
-                    else:
-                        this_edge += '0'
-                this_edge = get_edges_alldirections_rev(this_edge)
-                this_edges.append(this_edge)
+                        this_edge |= 1 << bit
+                this_edges.append(get_edge_class_by_mask(this_edge))
 
             random_region_target['edges'] = torch.tensor(edges, dtype=targets_i['edges'].dtype, device=targets_i['edges'].device)
 
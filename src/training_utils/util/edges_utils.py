@@ -7,4 +7,15 @@ edges_rev = {'0000': 0, '0001': 1, '0010': 2, '0011': 3, '0100': 4, '0110': 5, '
          '1000': 7, '1001': 8, '1011': 9, '1100': 10, '1101': 11, '1110': 12, '1111': 13, '0101': 14, '1010': 15}
 
 def get_edges_alldirections_rev(edges_class_rev):
-    return edges_rev[edges_class_rev]
\ No newline at end of file
+    return edges_rev[edges_class_rev]
+
+# Same reverse mapping indexed by a 4-bit integer mask, where bit i of the
+# mask corresponds to string position i. Callers that know neighbor presence
+# as booleans can build the mask with shifts and skip the string + dict hash.
+edge_class_by_mask = [0] * 16
+for _string, _edge_class in edges_rev.items():
+    edge_class_by_mask[int(_string[::-1], 2)] = _edge_class
+del _string, _edge_class
+
+def get_edge_class_by_mask(mask):
+    return edge_class_by_mask[mask]
\ No newline at end of file
@@ -1,6 +1,7 @@
 import copy
 import math
 import random
+from collections import defaultdict
 
 import networkx as nx
 import numpy as np
@@ -49,8 +50,7 @@ def get_cycle_basis_and_semantic_deprecated(best_result):
         es.append((d[output_edge[0]], d[output_edge[1]]))
 
     G = nx.Graph()
-    for e in es:
-        G.add_edge(e[0], e[1])
+    G.add_edges_from(es)
 
     nx.draw(G)
     # plt.show()
@@ -200,8 +200,7 @@ def get_cycle_basis_and_semantic(best_result):
     # print(d)
 
     G = nx.Graph()
-    for e in es:
-        G.add_edge(e[0], e[1])
+    G.add_edges_from(es)
 
     simple_cycles = []
     simple_cycles_number = []
@@ -228,6 +227,14 @@ def get_cycle_basis_and_semantic(best_result):
             output_points_c = [p for p in output_points if d[p] in c]
             output_edges_c = [e for e in output_edges if d[e[0]] in c or d[e[1]] in c]
             output_edges_c_copy_for_traversing = copy.deepcopy(output_edges_c)
+            # Incidence lists so each traversal step looks up the current
+            # point's edges directly instead of rescanning output_edges_c;
+            # append order matches the scan order.
+            incident_edges = defaultdict(list)
+            for edge in output_edges_c:
+                incident_edges[edge[0]].append(edge)
+                if edge[1] != edge[0]:
+                    incident_edges[edge[1]].append(edge)
 
             for edge_c in output_edges_c:
                 if edge_c not in output_edges_c_copy_for_traversing:
@@ -274,10 +281,7 @@ def get_cycle_basis_and_semantic(best_result):
 
                     while next_point != next_initial_point:
 
-                        relevant_edges = []
-                        for edge in output_edges_c:
-                            if edge[0] == current_point or edge[1] == current_point:
-                                relevant_edges.append(edge)
+                        relevant_edges = list(incident_edges[current_point])
 
                         relevant_edges_degree = []
                         for relevant_edge in relevant_edges:
@@ -442,8 +446,7 @@ def get_cycle_basis_and_semantic_2(best_result):
     # print(d)
 
     G = nx.Graph()
-    for e in es:
-        G.add_edge(e[0], e[1])
+    G.add_edges_from(es)
 
     simple_cycles = []
     simple_cycles_number = []
@@ -474,6 +477,14 @@ def get_cycle_basis_and_semantic_2(best_result):
             output_points_c = [p for p in output_points if d[p] in c]
             output_edges_c = [e for e in output_edges if d[e[0]] in c or d[e[1]] in c] # 固定的边集，不会删除
             output_edges_c_copy_for_traversing = copy.deepcopy(output_edges_c) # 用于遍历以减少时间复杂度的边集，其中的边会删除
+            # Incidence lists so each traversal step looks up the current
+            # point's edges directly instead of rescanning output_edges_c;
+            # append order matches the scan order.
+            incident_edges = defaultdict(list)
+            for edge in output_edges_c:
+                incident_edges[edge[0]].append(edge)
+                if edge[1] != edge[0]:
+                    incident_edges[edge[1]].append(edge)
             # print(output_points_c)
             # print(output_edges_c)
 
@@ -522,10 +533,7 @@ def get_cycle_basis_and_semantic_2(best_result):
 
                     while next_point != next_initial_point:
 
-                        relevant_edges = []
-                        for edge in output_edges_c:
-                            if edge[0] == current_point or edge[1] == current_point:
-                                relevant_edges.append(edge)
+                        relevant_edges = list(incident_edges[current_point])
 
                         relevant_edges_degree = []
                         for relevant_edge in relevant_edges:
@@ -93,6 +93,9 @@ def main():
         quatree_list_final[0] = l0
 
 
+        # Track visited nodes in a set; the previous membership tests
+        # scanned quatree_list and quatree_append_li per candidate.
+        visited = set(quatree_list)
         quatree_append_li = []
         liminus1 = l0
         i = 1
@@ -107,7 +110,8 @@ def main():
                     # li.extend([None, None, None, None])
                     pass
             for ni in li:
-                if (ni not in quatree_list) and (ni is not None) and (ni not in quatree_append_li):
+                if ni is not None and ni not in visited:
+                    visited.add(ni)
                     quatree_append_li.append(ni)
             quatree_list.extend(quatree_append_li)
             if len(quatree_append_li) > 0:
@@ -1,3 +1,4 @@
+import os
 import random
 
 import numpy as np
@@ -7,5 +8,14 @@ import torch
 def set_random_seed(args):
     seed = args.seed
     torch.manual_seed(seed)
+    torch.cuda.manual_seed_all(seed)
     np.random.seed(seed)
-    random.seed(seed)
\ No newline at end of file
+    random.seed(seed)
+    # Setting PYTHONHASHSEED here cannot change this interpreter's hash
+    # seed (that is fixed at startup); it only propagates to subprocesses
+    # such as spawned DataLoader workers. Pin cuDNN to deterministic
+    # kernels instead of benchmarking for the fastest (nondeterministic)
+    # algorithm.
+    os.environ['PYTHONHASHSEED'] = str(seed)
+    torch.backends.cudnn.deterministic = True
+    torch.backends.cudnn.benchmark = False
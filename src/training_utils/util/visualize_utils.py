@@ -14,6 +14,10 @@ def visualize_simplenet_singlelayer(unnormalized, output_points, result_edges_co
     unnormalized = np.ascontiguousarray(unnormalized)
     if output_points is not None:
         output_points = output_points.cpu().numpy().astype(np.int)
+        # Everything here is the same color/thickness, so the direction
+        # ticks can be collected and drawn with one polylines call instead
+        # of up to four cv2.line calls per point.
+        tick_segments = []
         for i, output_point in enumerate(output_points):
             cv2.rectangle(unnormalized,
                           (output_point[0] - 5, output_point[1] - 5),
@@ -22,34 +26,18 @@ def visualize_simplenet_singlelayer(unnormalized, output_points, result_edges_co
                           thickness=-1)
             if result_edges_confidence is not None:
                 edges = get_edges_alldirections(result_edges_confidence[i].item())
-                up_edge = int(edges[0])
-                left_edge = int(edges[1])
-                down_edge = int(edges[2])
-                right_edge = int(edges[3])
-                if up_edge:
-                    cv2.line(unnormalized,
-                             (output_point[0], output_point[1]),
-                             (output_point[0], output_point[1] - 12),
-                             color=(0, 0, 255),
-                             thickness=2)
-                if left_edge:
-                    cv2.line(unnormalized,
-                             (output_point[0], output_point[1]),
-                             (output_point[0] - 12, output_point[1]),
-                             color=(0, 0, 255),
-                             thickness=2)
-                if down_edge:
-                    cv2.line(unnormalized,
-                             (output_point[0], output_point[1]),
-                             (output_point[0], output_point[1] + 12),
-                             color=(0, 0, 255),
-                             thickness=2)
-                if right_edge:
-                    cv2.line(unnormalized,
-                             (output_point[0], output_point[1]),
-                             (output_point[0] + 12, output_point[1]),
-                             color=(0, 0, 255),
-                             thickness=2)
+                x, y = int(output_point[0]), int(output_point[1])
+                if int(edges[0]):
+                    tick_segments.append(((x, y), (x, y - 12)))
+                if int(edges[1]):
+                    tick_segments.append(((x, y), (x - 12, y)))
+                if int(edges[2]):
+                    tick_segments.append(((x, y), (x, y + 12)))
+                if int(edges[3]):
+                    tick_segments.append(((x, y), (x + 12, y)))
+        if tick_segments:
+            cv2.polylines(unnormalized, np.asarray(tick_segments, dtype=np.int32),
+                          isClosed=False, color=(0, 0, 255), thickness=2)
 
     cv2.imwrite(output_dir + '/val_visualize' + '/epoch' + str(epoch) + '/' + str(index) + '.jpg', unnormalized)
 